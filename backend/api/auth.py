@@ -69,12 +69,12 @@ def verify_password(password: str, hashed: str) -> bool:
 
 def create_access_token(user_id: str, email: str) -> str:
     """Create a JWT access token"""
-    expire = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
+    issued_at = datetime.utcnow()
     payload = {
         "user_id": user_id,
         "email": email,
-        "exp": expire,
-        "iat": datetime.utcnow()
+        "exp": issued_at + timedelta(hours=JWT_EXPIRATION_HOURS),
+        "iat": issued_at
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
@@ -126,28 +126,24 @@ async def get_current_user(
 async def register(user_data: UserCreate, db = Depends(get_db_connection)):
     """Register a new user"""
     try:
-        # Check if user already exists
-        existing_user = await db.fetchrow(
-            "SELECT id FROM users WHERE email = $1",
-            user_data.email
-        )
-        
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        
         # Hash password
         hashed_password = hash_password(user_data.password)
         
-        # Create user
+        # Create user; the unique email index rejects duplicates in the same
+        # round-trip, so no separate existence check is needed
         user = await db.fetchrow("""
             INSERT INTO users (email, name, password_hash)
             VALUES ($1, $2, $3)
+            ON CONFLICT (email) DO NOTHING
             RETURNING id, email, name, avatar_url
         """, user_data.email, user_data.name, hashed_password)
         
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        
         # Create access token
         access_token = create_access_token(str(user['id']), user['email'])
         
@@ -157,6 +153,8 @@ async def register(user_data: UserCreate, db = Depends(get_db_connection)):
             user=UserResponse(**dict(user))
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Registration failed: {e}")
         raise HTTPException(
@@ -262,17 +260,18 @@ async def password_reset_confirm(reset_data: PasswordResetConfirm, db = Depends(
         # Hash new password
         hashed_password = hash_password(reset_data.new_password)
         
-        # Update user password
-        await db.execute(
-            "UPDATE users SET password_hash = $1 WHERE id = $2",
-            hashed_password, reset_record['user_id']
-        )
-        
-        # Delete used reset token
-        await db.execute(
-            "DELETE FROM password_reset_tokens WHERE user_id = $1",
-            reset_record['user_id']
-        )
+        # Update the password and consume the token under one commit, so a
+        # failure between the two can't leave a reusable token behind
+        async with db.transaction():
+            await db.execute(
+                "UPDATE users SET password_hash = $1 WHERE id = $2",
+                hashed_password, reset_record['user_id']
+            )
+            
+            await db.execute(
+                "DELETE FROM password_reset_tokens WHERE user_id = $1",
+                reset_record['user_id']
+            )
         
         logger.info(f"Password reset successful for user {reset_record['email']}")
         
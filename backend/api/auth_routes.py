@@ -15,7 +15,7 @@ from auth.jwt_manager import jwt_manager, TokenType
 from auth.rbac import rbac_manager, Role, Permission, ResourceType
 from auth.dependencies import (
     get_current_user, get_current_user_optional, CurrentUser,
-    require_admin_access, require_permissions
+    require_admin_access, require_permissions, get_client_ip
 )
 from middleware.authorization import audit_logger
 
@@ -110,7 +110,7 @@ async def login(request: Request, login_data: LoginRequest):
     """Authenticate user and return tokens"""
     try:
         # Get request info
-        client_ip = getattr(request.client, 'host', 'unknown') if request.client else 'unknown'
+        client_ip = get_client_ip(request)
         user_agent = request.headers.get('user-agent', '')
         
         request_info = {
@@ -160,7 +160,7 @@ async def register(request: Request, register_data: RegisterRequest):
     """Register a new user"""
     try:
         # Get request info
-        client_ip = getattr(request.client, 'host', 'unknown') if request.client else 'unknown'
+        client_ip = get_client_ip(request)
         user_agent = request.headers.get('user-agent', '')
         
         request_info = {
@@ -23,6 +23,9 @@ from database.connection import get_db_connection
 
 logger = logging.getLogger(__name__)
 
+# Username suffixes checked per query when deriving a username from an email
+USERNAME_CANDIDATE_BATCH = 20
+
 @dataclass
 class UserCredentials:
     """User credentials for authentication"""
@@ -168,41 +171,39 @@ class AuthenticationService:
             if not is_valid:
                 return AuthResult(success=False, error_message="; ".join(errors))
             
-            # Check if user already exists
             async with get_db_connection() as conn:
-                existing_user = await conn.fetchrow(
-                    "SELECT id FROM users WHERE email = $1", email
-                )
-                if existing_user:
-                    return AuthResult(success=False, error_message="User already exists")
-                
                 # Generate username if not provided
                 username = registration.username
                 if not username:
                     username = await self._generate_username(email, conn)
                 
-                # Check username uniqueness
-                existing_username = await conn.fetchrow(
-                    "SELECT id FROM users WHERE username = $1", username
-                )
-                if existing_username:
-                    return AuthResult(success=False, error_message="Username already taken")
-                
                 # Hash password
                 password_hash = self.password_validator.hash_password(registration.password)
                 
-                # Create user
+                # Create user; the unique email/username indexes reject
+                # duplicates in the same statement instead of separate lookups
                 user_id = secrets.token_urlsafe(16)
                 verification_token = secrets.token_urlsafe(32)
                 
-                await conn.execute("""
+                inserted_id = await conn.fetchval("""
                     INSERT INTO users (
                         id, email, username, password_hash, first_name, last_name,
                         is_active, is_verified, verification_token, created_at
                     ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                    ON CONFLICT DO NOTHING
+                    RETURNING id
                 """, user_id, email, username, password_hash, registration.first_name,
                     registration.last_name, True, False, verification_token, datetime.utcnow())
                 
+                if inserted_id is None:
+                    # Only reached on conflict; work out which field clashed
+                    email_taken = await conn.fetchval(
+                        "SELECT EXISTS (SELECT 1 FROM users WHERE email = $1)", email
+                    )
+                    if email_taken:
+                        return AuthResult(success=False, error_message="User already exists")
+                    return AuthResult(success=False, error_message="Username already taken")
+                
                 # Assign default role
                 rbac_manager.assign_role(user_id, Role.ORG_MEMBER, granted_by="system")
                 
@@ -561,15 +562,24 @@ class AuthenticationService:
     async def _generate_username(self, email: str, conn) -> str:
         """Generate unique username from email"""
         base_username = email.split('@')[0]
-        username = base_username
-        counter = 1
         
+        # Check a block of suffixed candidates per indexed lookup instead of
+        # probing each suffix with its own round-trip
+        start = 0
         while True:
-            existing = await conn.fetchrow("SELECT id FROM users WHERE username = $1", username)
-            if not existing:
-                return username
-            username = f"{base_username}{counter}"
-            counter += 1
+            candidates = [
+                f"{base_username}{counter}" if counter else base_username
+                for counter in range(start, start + USERNAME_CANDIDATE_BATCH)
+            ]
+            rows = await conn.fetch(
+                "SELECT username FROM users WHERE username = ANY($1::text[])",
+                candidates
+            )
+            taken = {row['username'] for row in rows}
+            for username in candidates:
+                if username not in taken:
+                    return username
+            start += USERNAME_CANDIDATE_BATCH
     
     async def _send_verification_email(self, email: str, token: str):
         """Send email verification email"""
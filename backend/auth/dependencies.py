@@ -5,7 +5,7 @@ Integrates with the comprehensive RBAC and JWT management system.
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, FrozenSet
 import logging
 from datetime import datetime
 
@@ -30,12 +30,25 @@ class CurrentUser:
         self.token_type = claims.token_type
         self.issued_at = claims.issued_at
         self.expires_at = claims.expires_at
+        # A CurrentUser lives for one request, so RBAC lookups are memoized
+        # here and shared by every guard dependency on that request
+        self._permission_cache: Dict[Tuple[Optional[ResourceType], Optional[str]], FrozenSet[Permission]] = {}
+    
+    def get_permissions(self, resource_type: Optional[ResourceType] = None,
+                        resource_id: Optional[str] = None) -> FrozenSet[Permission]:
+        """Get the user's permissions in a specific context"""
+        key = (resource_type, resource_id)
+        permissions = self._permission_cache.get(key)
+        if permissions is None:
+            permissions = frozenset(rbac_manager.get_user_permissions(self.id, resource_type, resource_id))
+            self._permission_cache[key] = permissions
+        return permissions
         
     def has_permission(self, permission: Permission, 
                       resource_type: Optional[ResourceType] = None,
                       resource_id: Optional[str] = None) -> bool:
         """Check if user has specific permission"""
-        return rbac_manager.has_permission(self.id, permission, resource_type, resource_id)
+        return permission in self.get_permissions(resource_type, resource_id)
     
     def has_role(self, role: Role,
                 resource_type: Optional[ResourceType] = None,
@@ -59,6 +72,13 @@ class CurrentUser:
         """Check if user can access specific resource"""
         return rbac_manager.can_access_resource(self.id, resource_type, resource_id, permission)
 
+def get_client_ip(request: Optional[Request]) -> str:
+    """Get client IP address for audit logging"""
+    # Use the socket peer rather than X-Forwarded-For, which the client controls
+    if request is None or not request.client:
+        return 'unknown'
+    return request.client.host
+
 async def get_current_user_optional(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
@@ -96,7 +116,7 @@ async def get_current_user_optional(
             return None
         
         # Log successful authentication
-        client_ip = getattr(request.client, 'host', 'unknown') if request.client else 'unknown'
+        client_ip = get_client_ip(request)
         audit_logger.log_login_attempt(claims.user_id, client_ip, True)
         
         return CurrentUser(claims)
@@ -144,7 +164,7 @@ async def get_current_user(
             )
         
         # Log successful authentication
-        client_ip = getattr(request.client, 'host', 'unknown') if request.client else 'unknown'
+        client_ip = get_client_ip(request)
         audit_logger.log_login_attempt(claims.user_id, client_ip, True)
         
         return CurrentUser(claims)
@@ -176,7 +196,7 @@ async def get_api_key_user(
             )
         
         # Log API key usage
-        client_ip = getattr(request.client, 'host', 'unknown') if request.client else 'unknown'
+        client_ip = get_client_ip(request)
         audit_logger.log_login_attempt(claims.user_id, client_ip, True, "API_KEY")
         
         return CurrentUser(claims)
@@ -193,27 +213,27 @@ async def get_api_key_user(
 
 def require_permissions(*permissions: Permission):
     """Dependency factory to require specific permissions"""
+    required_permissions = frozenset(permissions)
+    
     def permission_dependency(
         current_user: CurrentUser = Depends(get_current_user),
         request: Request = None
     ) -> CurrentUser:
         # Check permissions
-        missing_permissions = []
-        for permission in permissions:
-            if not current_user.has_permission(permission):
-                missing_permissions.append(permission.value)
+        missing_permissions = required_permissions - current_user.get_permissions()
         
         if missing_permissions:
-            client_ip = getattr(request.client, 'host', 'unknown') if request and request.client else 'unknown'
+            missing_names = ', '.join(sorted(permission.value for permission in missing_permissions))
+            client_ip = get_client_ip(request)
             audit_logger.log_permission_denied(
                 current_user.id, 
-                ', '.join(missing_permissions), 
+                missing_names, 
                 "global", 
                 client_ip
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Missing required permissions: {', '.join(missing_permissions)}"
+                detail=f"Missing required permissions: {missing_names}"
             )
         
         return current_user
@@ -222,23 +242,25 @@ def require_permissions(*permissions: Permission):
 
 def require_roles(*roles: Role):
     """Dependency factory to require specific roles"""
+    required_roles = frozenset(role.value for role in roles)
+    role_names = ', '.join(role.value for role in roles)
+    
     def role_dependency(
         current_user: CurrentUser = Depends(get_current_user),
         request: Request = None
     ) -> CurrentUser:
         # Check roles
-        user_role_names = current_user.roles
-        if not any(role.value in user_role_names for role in roles):
-            client_ip = getattr(request.client, 'host', 'unknown') if request and request.client else 'unknown'
+        if required_roles.isdisjoint(current_user.roles):
+            client_ip = get_client_ip(request)
             audit_logger.log_permission_denied(
                 current_user.id, 
-                f"roles: {', '.join([role.value for role in roles])}", 
+                f"roles: {role_names}", 
                 "global", 
                 client_ip
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Missing required roles: {', '.join([role.value for role in roles])}"
+                detail=f"Missing required roles: {role_names}"
             )
         
         return current_user
@@ -247,6 +269,8 @@ def require_roles(*roles: Role):
 
 def require_resource_access(resource_type: ResourceType, permission: Permission):
     """Dependency factory to require access to a specific resource"""
+    denied_detail = f"Access denied to {resource_type.value}"
+    
     def resource_dependency(
         resource_id: str,
         current_user: CurrentUser = Depends(get_current_user),
@@ -254,7 +278,7 @@ def require_resource_access(resource_type: ResourceType, permission: Permission)
     ) -> CurrentUser:
         # Check resource access
         if not current_user.can_access_resource(resource_type, resource_id, permission):
-            client_ip = getattr(request.client, 'host', 'unknown') if request and request.client else 'unknown'
+            client_ip = get_client_ip(request)
             audit_logger.log_permission_denied(
                 current_user.id, 
                 permission.value, 
@@ -263,7 +287,7 @@ def require_resource_access(resource_type: ResourceType, permission: Permission)
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied to {resource_type.value}"
+                detail=denied_detail
             )
         
         return current_user
@@ -277,7 +301,7 @@ def require_admin():
         request: Request = None
     ) -> CurrentUser:
         if not current_user.is_admin():
-            client_ip = getattr(request.client, 'host', 'unknown') if request and request.client else 'unknown'
+            client_ip = get_client_ip(request)
             audit_logger.log_permission_denied(
                 current_user.id, 
                 "admin_privileges", 
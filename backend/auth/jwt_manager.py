@@ -7,8 +7,10 @@ import jwt
 import os
 import secrets
 import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import logging
@@ -102,6 +104,13 @@ class JWTManager:
         self.rotate_refresh_tokens = True
         self.refresh_token_reuse_window = timedelta(seconds=30)
         
+        # LRU of recently decoded claims, keyed by token hash (raw tokens are
+        # never stored). Only the decode is cached; blacklist, expiry and
+        # session checks still run on every verification.
+        self.token_cache_size = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+        self.token_cache_ttl_seconds = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "30"))
+        self._claims_cache: "OrderedDict[str, Tuple[TokenClaims, float]]" = OrderedDict()
+        
     def _generate_secret_key(self) -> str:
         """Generate a secure secret key"""
         return secrets.token_urlsafe(64)
@@ -110,6 +119,28 @@ class JWTManager:
         """Hash a token for secure storage"""
         return hashlib.sha256(token.encode()).hexdigest()
     
+    def _decode_claims(self, token: str, token_hash: str) -> TokenClaims:
+        """Decode a token, reusing the claims from a recent decode of the same token"""
+        now = time.monotonic()
+        cached = self._claims_cache.get(token_hash)
+        if cached and cached[1] > now:
+            self._claims_cache.move_to_end(token_hash)
+            return cached[0]
+        
+        payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        claims = TokenClaims.from_dict(payload)
+        
+        # Never cache past the token's own exp: hits skip jwt.decode's expiry check
+        cache_expires = min(
+            now + self.token_cache_ttl_seconds,
+            now + (payload["exp"] - time.time())
+        )
+        self._claims_cache[token_hash] = (claims, cache_expires)
+        self._claims_cache.move_to_end(token_hash)
+        if len(self._claims_cache) > self.token_cache_size:
+            self._claims_cache.popitem(last=False)
+        return claims
+    
     def _generate_session_id(self) -> str:
         """Generate a unique session ID"""
         return secrets.token_urlsafe(32)
@@ -169,8 +200,7 @@ class JWTManager:
                 logger.warning("Attempted to use blacklisted token")
                 return None
             
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            claims = TokenClaims.from_dict(payload)
+            claims = self._decode_claims(token, token_hash)
             
             # Verify token type
             if claims.token_type != expected_type:
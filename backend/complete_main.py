@@ -14,8 +14,10 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from contextlib import asynccontextmanager
+from pathlib import Path
 import uvicorn
 import uuid
+import asyncio
 import json
 import logging
 from enum import Enum
@@ -50,12 +52,25 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
     # Startup
     try:
-        await init_db()
-        await init_sample_data()
+        # Keep a connection warm for each of the concurrent seeders below
+        await init_db(pool_min=2)
+        
+        # Sample data and billing plans touch disjoint tables and each acquire
+        # their own pooled connection, so seed them concurrently
+        startup_tasks = [asyncio.create_task(init_sample_data())]
+        if BILLING_SERVICE_AVAILABLE:
+            startup_tasks.append(asyncio.create_task(billing_service.initialize_plans()))
+        try:
+            await asyncio.gather(*startup_tasks)
+        except BaseException:
+            # gather doesn't cancel the siblings of a failed task; stop them
+            # so an aborted startup leaves nothing running in the background
+            for task in startup_tasks:
+                task.cancel()
+            await asyncio.gather(*startup_tasks, return_exceptions=True)
+            raise
         
-        # Initialize billing system
         if BILLING_SERVICE_AVAILABLE:
-            await billing_service.initialize_plans()
             logging.info("Billing system initialized")
         
         logging.info("Database initialized successfully")
@@ -322,254 +337,120 @@ tasks_db: Dict[str, Task] = {}
 # DATABASE INITIALIZATION & SAMPLE DATA
 # =====================================
 
+SAMPLE_DATA_PATH = Path(__file__).parent / "database" / "sample_data.json"
+
+def load_sample_data() -> Dict[str, List[Dict[str, Any]]]:
+    """Load sample data fixtures, converting ISO date strings to dates"""
+    data = json.loads(SAMPLE_DATA_PATH.read_text(encoding="utf-8"))
+    for project in data["projects"]:
+        for field in ("start_date", "target_end_date"):
+            if project.get(field):
+                project[field] = date.fromisoformat(project[field])
+    for task in data["tasks"]:
+        if task.get("due_date"):
+            task["due_date"] = date.fromisoformat(task["due_date"])
+    return data
+
+# Loaded once at import instead of rebuilding the literals on every call
+SAMPLE_DATA = load_sample_data()
+
 # Initialize with sample data
 async def init_sample_data():
     """Initialize sample data in the database if it doesn't already exist"""
-    async with db_manager.get_connection() as conn:
-        # Check if sample data already exists
-        existing_users = await conn.fetch("SELECT COUNT(*) as count FROM users")
-        if existing_users[0]['count'] > 0:
+    # One transaction for the whole seed so the inserts share a single commit
+    # and a failure leaves no partial sample data behind
+    async with db_manager.get_connection() as conn, conn.transaction():
+        # Serialize concurrent startups (e.g. several workers) on a transaction
+        # lock so only one of them sees an empty users table and seeds
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext('agileforge_sample_data'))")
+        
+        # Check if sample data already exists; EXISTS stops at the first row
+        # where COUNT(*) would scan the whole table
+        if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM users)"):
             logging.info("Sample data already exists, skipping initialization")
             return
+        
+        # Sample rows can simply be re-seeded after a crash, so don't wait on
+        # the WAL flush; SET LOCAL reverts when this transaction ends
+        await conn.execute("SET LOCAL synchronous_commit = off")
             
         # Sample Users
-        sample_users = [
-            {
-                "id": "user-1",
-                "username": "sarah.chen",
-                "email": "sarah.chen@company.com",
-                "first_name": "Sarah",
-                "last_name": "Chen",
-                "avatar_url": "/placeholder.svg?height=32&width=32",
-                "password_hash": "dummy_hash"
-            },
-            {
-                "id": "user-2", 
-                "username": "alex.rodriguez",
-                "email": "alex.rodriguez@company.com",
-                "first_name": "Alex",
-                "last_name": "Rodriguez",
-                "avatar_url": "/placeholder.svg?height=32&width=32",
-                "password_hash": "dummy_hash"
-            },
-            {
-                "id": "user-3",
-                "username": "emily.johnson", 
-                "email": "emily.johnson@company.com",
-                "first_name": "Emily",
-                "last_name": "Johnson",
-                "avatar_url": "/placeholder.svg?height=32&width=32",
-                "password_hash": "dummy_hash"
-            },
-            {
-                "id": "user-4",
-                "username": "michael.brown",
-                "email": "michael.brown@company.com", 
-                "first_name": "Michael",
-                "last_name": "Brown",
-                "avatar_url": "/placeholder.svg?height=32&width=32",
-                "password_hash": "dummy_hash"
-            }
-        ]
+        sample_users = SAMPLE_DATA["users"]
         
-        # Insert users
-        for user_data in sample_users:
-            await conn.execute("""
-                INSERT INTO users (id, username, email, first_name, last_name, avatar_url, password_hash, is_active)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """, user_data["id"], user_data["username"], user_data["email"], 
-                user_data["first_name"], user_data["last_name"], user_data["avatar_url"], 
-                user_data["password_hash"], True)
+        # Insert users via binary COPY; the table is known to be empty here
+        await conn.copy_records_to_table(
+            "users",
+            records=[(user_data["id"], user_data["username"], user_data["email"],
+                      user_data["first_name"], user_data["last_name"], user_data["avatar_url"],
+                      user_data["password_hash"], True) for user_data in sample_users],
+            columns=["id", "username", "email", "first_name", "last_name", "avatar_url", "password_hash", "is_active"]
+        )
         
         # Sample Organizations
-        sample_organizations = [
-            {
-                "id": "org-1",
-                "name": "TechCorp Inc",
-                "slug": "techcorp",
-                "description": "Leading technology company",
-                "created_by": "user-1"
-            }
-        ]
+        sample_organizations = SAMPLE_DATA["organizations"]
         
-        # Insert organizations
-        for org_data in sample_organizations:
-            await conn.execute("""
-                INSERT INTO organizations (id, name, slug, description, created_by)
-                VALUES ($1, $2, $3, $4, $5)
-            """, org_data["id"], org_data["name"], org_data["slug"], 
-                org_data["description"], org_data["created_by"])
+        # Insert organizations as one unnest statement, like epics below
+        org_columns = ("id", "name", "slug", "description", "created_by")
+        await conn.execute("""
+            INSERT INTO organizations (id, name, slug, description, created_by)
+            SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[])
+        """, *([org_data[column] for org_data in sample_organizations] for column in org_columns))
         
         # Sample Projects
-        sample_projects = [
-            {
-                "id": "proj-1",
-                "organization_id": "org-1",
-                "name": "E-commerce Platform",
-                "key": "ECOM",
-                "description": "Next-generation e-commerce platform with AI recommendations",
-                "status": "in-progress",
-                "priority": "high",
-                "start_date": date(2024, 1, 1),
-                "target_end_date": date(2024, 6, 30),
-                "progress": 35,
-                "created_by": "user-1"
-            },
-            {
-                "id": "proj-2",
-                "organization_id": "org-1",
-                "name": "Mobile App",
-                "key": "MOBILE",
-                "description": "Cross-platform mobile application",
-                "status": "backlog",
-                "priority": "medium",
-                "start_date": date(2024, 3, 1),
-                "target_end_date": date(2024, 9, 30),
-                "progress": 10,
-                "created_by": "user-2"
-            }
-        ]
+        sample_projects = SAMPLE_DATA["projects"]
         
-        # Insert projects
-        for proj_data in sample_projects:
-            await conn.execute("""
-                INSERT INTO projects (id, organization_id, name, key, description, status, priority, start_date, target_end_date, progress, created_by)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-            """, proj_data["id"], proj_data["organization_id"], proj_data["name"], proj_data["key"], proj_data["description"],
-                proj_data["status"], proj_data["priority"], proj_data["start_date"], 
-                proj_data["target_end_date"], proj_data["progress"], proj_data["created_by"])
+        # Insert projects as one unnest statement; the fixture dates go in as
+        # date[] and the server widens them to the timestamptz columns
+        project_columns = ("id", "organization_id", "name", "key", "description", "status", "priority",
+                           "start_date", "target_end_date", "progress", "created_by")
+        await conn.execute("""
+            INSERT INTO projects (id, organization_id, name, key, description, status, priority, start_date, target_end_date, progress, created_by)
+            SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[], $6::text[],
+                                 $7::text[], $8::date[], $9::date[], $10::int[], $11::text[])
+        """, *([proj_data[column] for proj_data in sample_projects] for column in project_columns))
     
         # Sample Epics
-        sample_epics = [
-            {
-                "id": "epic-1",
-                "project_id": "proj-1",
-                "title": "User Authentication System",
-                "description": "Complete user authentication and authorization system",
-                "epic_key": "ECOM-1",
-                "status": "in-progress",
-                "priority": "critical",
-                "estimated_story_points": 21,
-                "actual_story_points": 8,
-                "progress": 40,
-                "created_by": "user-1"
-            },
-            {
-                "id": "epic-2",
-                "project_id": "proj-1",
-                "title": "Product Catalog",
-                "description": "Product browsing and search functionality",
-                "epic_key": "ECOM-2",
-                "status": "backlog",
-                "priority": "high",
-                "estimated_story_points": 34,
-                "actual_story_points": 0,
-                "progress": 0,
-                "created_by": "user-2"
-            }
-        ]
+        sample_epics = SAMPLE_DATA["epics"]
         
-        # Insert epics
-        for epic_data in sample_epics:
-            await conn.execute("""
-                INSERT INTO epics (id, project_id, title, description, epic_key, status, priority, 
-                                 estimated_story_points, actual_story_points, progress, created_by)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-            """, epic_data["id"], epic_data["project_id"], epic_data["title"], epic_data["description"],
-                epic_data["epic_key"], epic_data["status"], epic_data["priority"], 
-                epic_data["estimated_story_points"], epic_data["actual_story_points"], 
-                epic_data["progress"], epic_data["created_by"])
+        # Insert epics as one statement by unnesting column arrays
+        epic_columns = ("id", "project_id", "title", "description", "epic_key", "status", "priority",
+                        "estimated_story_points", "actual_story_points", "progress", "created_by")
+        await conn.execute("""
+            INSERT INTO epics (id, project_id, title, description, epic_key, status, priority,
+                             estimated_story_points, actual_story_points, progress, created_by)
+            SELECT * FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[], $6::text[],
+                                 $7::text[], $8::int[], $9::int[], $10::int[], $11::text[])
+        """, *([epic_data[column] for epic_data in sample_epics] for column in epic_columns))
     
         # Sample Stories
-        sample_stories = [
-            {
-                "id": "story-1",
-                "epic_id": "epic-1",
-                "title": "User Registration",
-                "description": "Allow new users to register with email and password",
-                "story_key": "ECOM-3",
-                "as_a": "new user",
-                "i_want": "to register an account",
-                "so_that": "I can access the platform",
-                "acceptance_criteria": "Given a new user visits registration page, when they provide valid email and password, then account is created and welcome email is sent",
-                "status": "done",
-                "priority": "high",
-                "story_points": 5,
-                "assignee_id": "user-1",
-                "created_by": "user-1"
-            },
-            {
-                "id": "story-2",
-                "epic_id": "epic-1",
-                "title": "User Login",
-                "description": "Allow existing users to login with credentials",
-                "story_key": "ECOM-4",
-                "as_a": "registered user",
-                "i_want": "to login to my account",
-                "so_that": "I can access personalized features",
-                "acceptance_criteria": "Given a registered user provides valid credentials, when they submit login form, then they are authenticated and redirected to dashboard",
-                "status": "in-progress",
-                "priority": "high",
-                "story_points": 3,
-                "assignee_id": "user-2",
-                "created_by": "user-1"
-            }
-        ]
+        sample_stories = SAMPLE_DATA["stories"]
         
-        # Insert stories
-        for story_data in sample_stories:
-            await conn.execute("""
-                INSERT INTO stories (id, epic_id, title, description, story_key, as_a, i_want, so_that, 
-                                   acceptance_criteria, status, priority, story_points, assignee_id, created_by)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-            """, story_data["id"], story_data["epic_id"], story_data["title"], story_data["description"],
-                story_data["story_key"], story_data["as_a"], story_data["i_want"], story_data["so_that"],
-                story_data["acceptance_criteria"], story_data["status"], story_data["priority"], 
-                story_data["story_points"], story_data["assignee_id"], story_data["created_by"])
+        # Insert stories via binary COPY; they are the widest rows in the seed
+        await conn.copy_records_to_table(
+            "stories",
+            records=[(story_data["id"], story_data["epic_id"], story_data["title"], story_data["description"],
+                      story_data["story_key"], story_data["as_a"], story_data["i_want"], story_data["so_that"],
+                      story_data["acceptance_criteria"], story_data["status"], story_data["priority"],
+                      story_data["story_points"], story_data["assignee_id"], story_data["created_by"])
+                     for story_data in sample_stories],
+            columns=["id", "epic_id", "title", "description", "story_key", "as_a", "i_want", "so_that",
+                     "acceptance_criteria", "status", "priority", "story_points", "assignee_id", "created_by"]
+        )
     
         # Sample Tasks
-        sample_tasks = [
-            {
-                "id": "task-1",
-                "story_id": "story-2",
-                "title": "Implement login form validation",
-                "description": "Add client-side and server-side validation for login form",
-                "task_key": "ECOM-5",
-                "status": "in-progress",
-                "priority": "high",
-                "assignee_id": "user-2",
-                "estimated_hours": 8.0,
-                "actual_hours": 5.0,
-                "due_date": date(2024, 2, 15),
-                "created_by": "user-2"
-            },
-            {
-                "id": "task-2",
-                "story_id": "story-2",
-                "title": "Set up password encryption",
-                "description": "Implement bcrypt password hashing",
-                "task_key": "ECOM-6", 
-                "status": "todo",
-                "priority": "critical",
-                "assignee_id": "user-3",
-                "estimated_hours": 4.0,
-                "actual_hours": 0.0,
-                "due_date": date(2024, 2, 10),
-                "created_by": "user-2"
-            }
-        ]
+        sample_tasks = SAMPLE_DATA["tasks"]
         
-        # Insert tasks
-        for task_data in sample_tasks:
-            await conn.execute("""
-                INSERT INTO tasks (id, story_id, title, description, task_key, status, priority, 
-                                 assignee_id, estimated_hours, actual_hours, due_date, created_by)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-            """, task_data["id"], task_data["story_id"], task_data["title"], task_data["description"],
-                task_data["task_key"], task_data["status"], task_data["priority"], 
-                task_data["assignee_id"], task_data["estimated_hours"], task_data["actual_hours"], 
-                task_data["due_date"], task_data["created_by"])
-                
+        # Insert tasks via binary COPY, same as stories
+        await conn.copy_records_to_table(
+            "tasks",
+            records=[(task_data["id"], task_data["story_id"], task_data["title"], task_data["description"],
+                      task_data["task_key"], task_data["status"], task_data["priority"],
+                      task_data["assignee_id"], task_data["estimated_hours"], task_data["actual_hours"],
+                      task_data["due_date"], task_data["created_by"]) for task_data in sample_tasks],
+            columns=["id", "story_id", "title", "description", "task_key", "status", "priority",
+                     "assignee_id", "estimated_hours", "actual_hours", "due_date", "created_by"]
+        )
+
         logging.info("Sample data initialized successfully")
 
 # =====================================
@@ -611,21 +492,19 @@ async def health_check():
 async def api_status():
     """API status with entity counts"""
     async with db_manager.get_connection() as conn:
-        users_count = await conn.fetchval("SELECT COUNT(*) FROM users")
-        projects_count = await conn.fetchval("SELECT COUNT(*) FROM projects")
-        epics_count = await conn.fetchval("SELECT COUNT(*) FROM epics")
-        stories_count = await conn.fetchval("SELECT COUNT(*) FROM stories")
-        tasks_count = await conn.fetchval("SELECT COUNT(*) FROM tasks")
+        # All five counts in one round-trip
+        counts = await conn.fetchrow("""
+            SELECT
+                (SELECT COUNT(*) FROM users) AS users,
+                (SELECT COUNT(*) FROM projects) AS projects,
+                (SELECT COUNT(*) FROM epics) AS epics,
+                (SELECT COUNT(*) FROM stories) AS stories,
+                (SELECT COUNT(*) FROM tasks) AS tasks
+        """)
         
         return {
             "status": "operational",
-            "entities": {
-                "users": users_count,
-                "projects": projects_count,
-                "epics": epics_count,
-                "stories": stories_count,
-                "tasks": tasks_count
-            },
+            "entities": dict(counts),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -837,13 +716,14 @@ async def delete_project(project_id: str):
 @app.get("/api/epics", response_model=List[Epic])
 async def get_epics(project_id: Optional[str] = Query(None)):
     """Get all epics, optionally filtered by project"""
+    # Reject serialized objects before taking a pool connection; raised inside
+    # the try below, the 400 was swallowed and reported as a 500
+    if project_id and (project_id.startswith('[object') or '{' in project_id):
+        raise HTTPException(status_code=400, detail="Invalid project_id format")
+    
     try:
         async with db_manager.get_connection() as conn:
             if project_id and project_id.strip():
-                # Check if project_id is not a serialized object
-                if project_id.startswith('[object') or '{' in project_id:
-                    raise HTTPException(status_code=400, detail="Invalid project_id format")
-                
                 # Fetch epics filtered by project_id
                 rows = await conn.fetch("SELECT * FROM epics WHERE project_id = $1 ORDER BY created_at DESC", project_id)
             else:
@@ -956,13 +836,13 @@ async def delete_epic(epic_id: str):
 @app.get("/api/stories", response_model=List[Story])
 async def get_stories(epic_id: Optional[str] = Query(None)):
     """Get all stories, optionally filtered by epic"""
+    # Same up-front format check as get_epics
+    if epic_id and (epic_id.startswith('[object') or '{' in epic_id):
+        raise HTTPException(status_code=400, detail="Invalid epic_id format")
+    
     try:
         async with db_manager.get_connection() as conn:
             if epic_id and epic_id.strip():
-                # Check if epic_id is not a serialized object
-                if epic_id.startswith('[object') or '{' in epic_id:
-                    raise HTTPException(status_code=400, detail="Invalid epic_id format")
-                
                 # Fetch stories filtered by epic_id
                 rows = await conn.fetch("SELECT * FROM stories WHERE epic_id = $1 ORDER BY created_at DESC", epic_id)
             else:
@@ -1028,18 +908,20 @@ async def get_story(story_id: str):
 async def create_story(story_data: StoryCreate):
     """Create new story"""
     async with db_manager.get_connection() as conn:
-        # Verify epic exists
-        epic = await conn.fetchrow("SELECT * FROM epics WHERE id = $1", story_data.epic_id)
-        if not epic:
+        # Verify the epic exists and fetch its project key in one round-trip
+        lineage = await conn.fetchrow("""
+            SELECT e.id AS epic_id, p.id AS project_id, p.key AS project_key
+            FROM epics e
+            LEFT JOIN projects p ON p.id = e.project_id
+            WHERE e.id = $1
+        """, story_data.epic_id)
+        if not lineage:
             raise HTTPException(status_code=404, detail="Epic not found")
-        
-        # Get project info for key generation
-        project = await conn.fetchrow("SELECT * FROM projects WHERE id = $1", epic['project_id'])
-        if not project:
+        if lineage['project_id'] is None:
             raise HTTPException(status_code=404, detail="Project not found")
         
         story_id = str(uuid.uuid4())
-        story_key = await generate_key(project['key'], "story")
+        story_key = await generate_key(lineage['project_key'], "story")
         now = datetime.now()
         
         # Insert into database
@@ -1075,61 +957,42 @@ async def create_story(story_data: StoryCreate):
 async def update_story(story_id: str, story_data: StoryUpdate):
     """Update story"""
     async with db_manager.get_connection() as conn:
-        # Check if story exists
-        existing_story = await conn.fetchrow("SELECT * FROM stories WHERE id = $1", story_id)
-        if not existing_story:
-            raise HTTPException(status_code=404, detail="Story not found")
-        
         # Prepare update data
         update_data = story_data.dict(exclude_unset=True)
         if not update_data:
             # No fields to update, return existing story
-            return Story(
-                id=existing_story['id'],
-                epic_id=existing_story['epic_id'],
-                title=existing_story['title'],
-                description=existing_story['description'],
-                story_key=existing_story['story_key'],
-                as_a=existing_story['as_a'],
-                i_want=existing_story['i_want'],
-                so_that=existing_story['so_that'],
-                acceptance_criteria=existing_story['acceptance_criteria'],
-                status=StatusType(existing_story['status']),
-                priority=PriorityLevel(existing_story['priority']),
-                story_points=existing_story['story_points'],
-                assignee_id=existing_story['assignee_id'],
-                due_date=existing_story['due_date'],
-                created_by=existing_story['created_by'],
-                created_at=existing_story['created_at'],
-                updated_at=existing_story['updated_at']
-            )
-        
-        # Build dynamic update query
-        set_clauses = []
-        values = []
-        param_count = 1
-        
-        for field, value in update_data.items():
-            if field in ['status', 'priority'] and value:
-                set_clauses.append(f"{field} = ${param_count}")
-                values.append(value.value if hasattr(value, 'value') else value)
-            else:
-                set_clauses.append(f"{field} = ${param_count}")
-                values.append(value)
+            updated_row = await conn.fetchrow("SELECT * FROM stories WHERE id = $1", story_id)
+        else:
+            # Build dynamic update query
+            set_clauses = []
+            values = []
+            param_count = 1
+            
+            for field, value in update_data.items():
+                if field in ['status', 'priority'] and value:
+                    set_clauses.append(f"{field} = ${param_count}")
+                    values.append(value.value if hasattr(value, 'value') else value)
+                else:
+                    set_clauses.append(f"{field} = ${param_count}")
+                    values.append(value)
+                param_count += 1
+            
+            # Add updated_at
+            set_clauses.append(f"updated_at = ${param_count}")
+            values.append(datetime.now())
             param_count += 1
+            
+            # Add story_id for WHERE clause
+            values.append(story_id)
+            
+            query = f"UPDATE stories SET {', '.join(set_clauses)} WHERE id = ${param_count} RETURNING *"
+            
+            # Execute update; RETURNING yields no row for a missing story, so
+            # no separate existence check is needed
+            updated_row = await conn.fetchrow(query, *values)
         
-        # Add updated_at
-        set_clauses.append(f"updated_at = ${param_count}")
-        values.append(datetime.now())
-        param_count += 1
-        
-        # Add story_id for WHERE clause
-        values.append(story_id)
-        
-        query = f"UPDATE stories SET {', '.join(set_clauses)} WHERE id = ${param_count} RETURNING *"
-        
-        # Execute update
-        updated_row = await conn.fetchrow(query, *values)
+        if not updated_row:
+            raise HTTPException(status_code=404, detail="Story not found")
         
         return Story(
             id=updated_row['id'],
@@ -1155,13 +1018,9 @@ async def update_story(story_id: str, story_data: StoryUpdate):
 async def delete_story(story_id: str):
     """Delete story"""
     async with db_manager.get_connection() as conn:
-        # Check if story exists
-        existing_story = await conn.fetchrow("SELECT * FROM stories WHERE id = $1", story_id)
-        if not existing_story:
+        result = await conn.execute("DELETE FROM stories WHERE id = $1", story_id)
+        if result == "DELETE 0":
             raise HTTPException(status_code=404, detail="Story not found")
-        
-        # Delete the story
-        await conn.execute("DELETE FROM stories WHERE id = $1", story_id)
         return {"message": "Story deleted successfully"}
 
 # =====================================
@@ -1183,6 +1042,13 @@ class GeneratedStoryResponse(BaseModel):
     confidence: Optional[float] = None
     suggestions: Optional[List[str]] = None
 
+# Fallback story point estimates, checked in order against the description
+STORY_POINT_RULES = (
+    (("complex", "integration", "multiple", "advanced"), 8),
+    (("simple", "basic", "quick"), 2),
+    (("dashboard", "analytics", "reporting"), 5),
+)
+
 @app.post("/api/stories/generate", response_model=GeneratedStoryResponse)
 @track_usage("ai_story_generation", 1) if BILLING_SERVICE_AVAILABLE else lambda f: f
 async def generate_story(request: StoryGenerateRequest):
@@ -1346,14 +1212,12 @@ async def generate_story(request: StoryGenerateRequest):
             else:
                 tags = ["feature", "user-story", "functionality"]
         
-        # Estimate story points based on complexity
-        story_points = 3  # Default
-        if any(word in description_lower for word in ["complex", "integration", "multiple", "advanced"]):
-            story_points = 8
-        elif any(word in description_lower for word in ["simple", "basic", "quick"]):
-            story_points = 2
-        elif any(word in description_lower for word in ["dashboard", "analytics", "reporting"]):
-            story_points = 5
+        # Estimate story points based on complexity; first matching rule wins
+        story_points = next(
+            (points for keywords, points in STORY_POINT_RULES
+             if any(word in description_lower for word in keywords)),
+            3  # Default
+        )
         
         story_data = {
             "name": title,
@@ -1406,20 +1270,24 @@ async def create_task(task_data: TaskCreate):
     """Create new task"""
     # Check if story exists in database and get project info
     async with db_manager.get_connection() as conn:
-        story = await conn.fetchrow("SELECT * FROM stories WHERE id = $1", task_data.story_id)
-        if not story:
+        # Resolve story -> epic -> project in one round-trip; the LEFT JOINs
+        # keep the individual "not found" errors distinguishable
+        lineage = await conn.fetchrow("""
+            SELECT s.id AS story_id, e.id AS epic_id, p.id AS project_id, p.key AS project_key
+            FROM stories s
+            LEFT JOIN epics e ON e.id = s.epic_id
+            LEFT JOIN projects p ON p.id = e.project_id
+            WHERE s.id = $1
+        """, task_data.story_id)
+        if not lineage:
             raise HTTPException(status_code=404, detail="Story not found")
-        
-        epic = await conn.fetchrow("SELECT * FROM epics WHERE id = $1", story['epic_id'])
-        if not epic:
+        if lineage['epic_id'] is None:
             raise HTTPException(status_code=404, detail="Epic not found")
-        
-        project = await conn.fetchrow("SELECT * FROM projects WHERE id = $1", epic['project_id'])
-        if not project:
+        if lineage['project_id'] is None:
             raise HTTPException(status_code=404, detail="Project not found")
     
     task_id = str(uuid.uuid4())
-    task_key = await generate_key(project['key'], "task")
+    task_key = await generate_key(lineage['project_key'], "task")
     now = datetime.now()
     
     # Create task object
@@ -1524,8 +1392,11 @@ async def get_project_analytics(project_id: str):
     
     project = projects_db[project_id]
     project_epics = [e for e in epics_db.values() if e.project_id == project_id]
-    project_stories = [s for s in stories_db.values() if s.epic_id in [e.id for e in project_epics]]
-    project_tasks = [t for t in tasks_db.values() if t.story_id in [s.id for s in project_stories]]
+    # Build the id sets once; the old inline lists were rebuilt and scanned per item
+    epic_ids = {e.id for e in project_epics}
+    project_stories = [s for s in stories_db.values() if s.epic_id in epic_ids]
+    story_ids = {s.id for s in project_stories}
+    project_tasks = [t for t in tasks_db.values() if t.story_id in story_ids]
     
     return {
         "project": project,
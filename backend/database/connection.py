@@ -14,26 +14,30 @@ class DatabaseManager:
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is required")
     
-    async def init_pool(self):
+    async def init_pool(self, min_size: int = 1, max_size: int = 10):
         """Initialize the connection pool"""
+        if self.pool is not None:
+            # Already initialized in this process; reuse the existing pool
+            return
+        
         try:
-            # Parse the database URL for Render PostgreSQL
+            # Parse the database URL for Render PostgreSQL.
+            # create_pool opens min_size connections eagerly, so a bad URL or
+            # unreachable server already fails here without an extra test query.
             self.pool = await asyncpg.create_pool(
                 self.database_url,
-                min_size=1,
-                max_size=10,
+                min_size=min_size,
+                max_size=max_size,
                 command_timeout=60,
+                # Dynamic UPDATE ... SET builders produce many distinct query
+                # texts; a larger cache keeps the hot ones prepared
+                statement_cache_size=1024,
                 server_settings={
                     'jit': 'off'  # Disable JIT for better compatibility
                 }
             )
             logger.info("Database connection pool initialized")
-            
-            # Test the connection
-            async with self.pool.acquire() as conn:
-                await conn.execute("SELECT 1")
-                logger.info("Database connection test successful")
-                
+
         except Exception as e:
             logger.error(f"Failed to initialize database pool: {e}")
             raise
@@ -42,6 +46,7 @@ class DatabaseManager:
         """Close the connection pool"""
         if self.pool:
             await self.pool.close()
+            self.pool = None
             logger.info("Database connection pool closed")
     
     @asynccontextmanager
@@ -56,9 +61,9 @@ class DatabaseManager:
 # Global database manager instance
 db_manager = DatabaseManager()
 
-async def init_db():
+async def init_db(pool_min: int = 1, pool_max: int = 10):
     """Initialize database connection"""
-    await db_manager.init_pool()
+    await db_manager.init_pool(min_size=pool_min, max_size=pool_max)
     # Skip migrations since auth schema is already deployed
     logger.info("Database connection initialized - auth schema already deployed")
 
@@ -6,6 +6,13 @@ import os
 import logging
 from typing import List
 
+# orjson encodes responses in C; fall back to the stdlib encoder without it
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
 # Import routers
 from .api.ai_endpoints import router as ai_router
 from .api.stories import router as stories_router
@@ -14,7 +21,6 @@ from .api.projects import router as projects_router
 from .api.epics import router as epics_router
 from .api.users import router as users_router
 from .database.connection import init_db, close_db
-from .middleware.auth import AuthMiddleware
 from .middleware.logging import LoggingMiddleware
 
 # Configure logging
@@ -28,7 +34,9 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting AgileScribe API...")
-    await init_db()
+    # create_pool opens min_size connections up front, so a larger floor keeps
+    # the first burst of requests from paying connection setup serially
+    await init_db(pool_min=int(os.getenv("DB_POOL_MIN_SIZE", "5")))
     logger.info("Database initialized")
     yield
     # Shutdown
@@ -42,6 +50,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if os.getenv("ENVIRONMENT") != "production" else None,
     redoc_url="/redoc" if os.getenv("ENVIRONMENT") != "production" else None,
+    default_response_class=DefaultResponse,
     lifespan=lifespan
 )
 
@@ -50,22 +59,25 @@ allowed_origins = [
     "http://localhost:3000",  # Local development
     "http://localhost:3001",  # Alternative local port
     "https://v0-agile-forge-40higfdur-clariq.vercel.app",  # Your Vercel deployment
-    "https://*.vercel.app",  # Vercel preview deployments
 ]
 
 # Add environment-specific origins
 if os.getenv("FRONTEND_URL"):
     allowed_origins.append(os.getenv("FRONTEND_URL"))
 
+# CORSMiddleware only matches allow_origins exactly, so wildcard entries like
+# "https://*.vercel.app" never matched; express them as one regex instead
+allowed_origin_patterns = [
+    r"https://v0-agile-forge-[a-z0-9]+-clariq\.vercel\.app",  # Vercel preview deployments
+]
+
 if os.getenv("ENVIRONMENT") == "development":
-    allowed_origins.extend([
-        "http://localhost:*",
-        "http://127.0.0.1:*"
-    ])
+    allowed_origin_patterns.append(r"http://(localhost|127\.0\.0\.1):\d+")
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
+    allow_origin_regex="|".join(allowed_origin_patterns),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
@@ -82,8 +94,10 @@ app.add_middleware(
     ]
 )
 
-# Custom middleware
-app.add_middleware(AuthMiddleware)
+# Custom middleware. AuthMiddleware (middleware/auth.py) is not registered: it
+# passes every request through unchanged, and as a BaseHTTPMiddleware it would
+# still cost an extra task and stream pair per request. Route-level
+# dependencies in api/auth.py do the actual authentication.
 app.add_middleware(LoggingMiddleware)
 
 # Health check endpoint
@@ -114,12 +128,12 @@ app.include_router(ai_router, prefix="/api/ai", tags=["AI Features"])
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return {"error": "Endpoint not found", "status_code": 404}
+    return DefaultResponse({"error": "Endpoint not found", "status_code": 404}, status_code=404)
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
     logger.error(f"Internal server error: {exc}")
-    return {"error": "Internal server error", "status_code": 500}
+    return DefaultResponse({"error": "Internal server error", "status_code": 500}, status_code=500)
 
 if __name__ == "__main__":
     import uvicorn
@@ -4,19 +4,18 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Built once at import rather than on every request
+PUBLIC_PATHS = frozenset({"/health", "/", "/docs", "/redoc", "/openapi.json"})
+AUTH_PATH_PREFIX = "/api/auth"
+
 class AuthMiddleware(BaseHTTPMiddleware):
     """Authentication middleware for processing requests"""
     
     async def dispatch(self, request: Request, call_next):
-        # Skip auth for public endpoints
-        public_paths = ["/health", "/", "/docs", "/redoc", "/openapi.json"]
-        
-        if request.url.path in public_paths:
-            response = await call_next(request)
-            return response
+        path = request.url.path
         
-        # For auth endpoints, allow without token
-        if request.url.path.startswith("/api/auth"):
+        # Skip auth for public endpoints; for auth endpoints, allow without token
+        if path in PUBLIC_PATHS or path.startswith(AUTH_PATH_PREFIX):
             response = await call_next(request)
             return response
         
@@ -6,13 +6,14 @@ Provides comprehensive route protection, permission checking, and security featu
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.base import BaseHTTPMiddleware
-from typing import List, Optional, Dict, Any, Callable, Union
+from typing import List, Optional, Dict, Any, Callable, Union, Tuple
 from functools import wraps
 import logging
 import time
 import asyncio
 from datetime import datetime, timedelta
 import re
+import heapq
 from collections import defaultdict
 
 from auth.rbac import rbac_manager, Permission, ResourceType, Role
@@ -35,7 +36,8 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         self.failed_login_attempts = defaultdict(list)
         
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         try:
             # Rate limiting
@@ -51,8 +53,9 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             self._add_security_headers(response)
             
             # Log request
-            process_time = time.time() - start_time
-            logger.info(f"{request.method} {request.url.path} - {response.status_code} - {process_time:.3f}s")
+            if logger.isEnabledFor(logging.INFO):
+                process_time = loop.time() - start_time
+                logger.info("%s %s - %d - %.3fs", request.method, request.url.path, response.status_code, process_time)
             
             return response
             
@@ -69,7 +72,7 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         """Get client IP address"""
         forwarded = request.headers.get("X-Forwarded-For")
         if forwarded:
-            return forwarded.split(",")[0].strip()
+            return forwarded.partition(",")[0].strip()
         return request.client.host if request.client else "unknown"
     
     def _add_security_headers(self, response):
@@ -81,46 +84,46 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
 
 class RateLimiter:
-    """Rate limiting implementation"""
+    """Fixed-window rate limiting implementation"""
     
     def __init__(self):
-        self.requests = defaultdict(list)
-        self.cleanup_interval = 60
-        self.last_cleanup = time.time()
+        # identifier -> (request count, window start)
+        self.requests: Dict[str, Tuple[int, float]] = {}
+        # (window expiry, identifier) for every window opened, soonest first
+        self._expiry_heap: List[Tuple[float, str]] = []
     
     def is_allowed(self, identifier: str) -> bool:
         """Check if request is allowed based on rate limit"""
         now = time.time()
         
-        # Cleanup old entries periodically
-        if now - self.last_cleanup > self.cleanup_interval:
+        # Drop identifiers whose window has lapsed so idle clients don't accumulate
+        if self._expiry_heap and self._expiry_heap[0][0] <= now:
             self._cleanup_old_entries(now)
-            self.last_cleanup = now
         
-        # Get recent requests for this identifier
-        recent_requests = self.requests[identifier]
+        entry = self.requests.get(identifier)
         
-        # Remove requests outside the window
-        cutoff_time = now - RATE_LIMIT_WINDOW
-        recent_requests[:] = [req_time for req_time in recent_requests if req_time > cutoff_time]
+        # New or expired windows start over on this request
+        if entry is None or now - entry[1] >= RATE_LIMIT_WINDOW:
+            self.requests[identifier] = (1, now)
+            heapq.heappush(self._expiry_heap, (now + RATE_LIMIT_WINDOW, identifier))
+            return True
         
         # Check if limit exceeded
-        if len(recent_requests) >= RATE_LIMIT_REQUESTS:
+        count, window_start = entry
+        if count >= RATE_LIMIT_REQUESTS:
             return False
         
-        # Add current request
-        recent_requests.append(now)
+        self.requests[identifier] = (count + 1, window_start)
         return True
     
     def _cleanup_old_entries(self, now: float):
-        """Clean up old rate limit entries"""
+        """Clean up expired rate limit entries"""
         cutoff_time = now - RATE_LIMIT_WINDOW
-        for identifier in list(self.requests.keys()):
-            self.requests[identifier][:] = [
-                req_time for req_time in self.requests[identifier] 
-                if req_time > cutoff_time
-            ]
-            if not self.requests[identifier]:
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, identifier = heapq.heappop(self._expiry_heap)
+            entry = self.requests.get(identifier)
+            # Skip heap entries left behind by a window that has since restarted
+            if entry is not None and entry[1] <= cutoff_time:
                 del self.requests[identifier]
 
 class AuthenticationManager:
@@ -191,6 +194,8 @@ auth_manager = AuthenticationManager()
 
 def require_permissions(*permissions: Permission):
     """Decorator to require specific permissions"""
+    required_permissions = frozenset(permissions)
+    
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -209,13 +214,14 @@ def require_permissions(*permissions: Permission):
             
             # Check permissions
             user_permissions = rbac_manager.get_user_permissions(current_user.user_id)
-            missing_permissions = [perm for perm in permissions if perm not in user_permissions]
+            missing_permissions = required_permissions.difference(user_permissions)
             
             if missing_permissions:
-                logger.warning(f"User {current_user.user_id} missing permissions: {missing_permissions}")
+                missing_names = sorted(perm.value for perm in missing_permissions)
+                logger.warning(f"User {current_user.user_id} missing permissions: {missing_names}")
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Missing required permissions: {', '.join(missing_permissions)}"
+                    detail=f"Missing required permissions: {', '.join(missing_names)}"
                 )
             
             return await func(*args, **kwargs)
@@ -224,6 +230,9 @@ def require_permissions(*permissions: Permission):
 
 def require_roles(*roles: Role):
     """Decorator to require specific roles"""
+    required_roles = frozenset(roles)
+    role_names = ', '.join(roles)
+    
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -242,13 +251,12 @@ def require_roles(*roles: Role):
             
             # Check roles
             user_roles = rbac_manager.get_user_roles(current_user.user_id)
-            user_role_names = [role.role for role in user_roles]
             
-            if not any(role in user_role_names for role in roles):
+            if required_roles.isdisjoint(user_role.role for user_role in user_roles):
                 logger.warning(f"User {current_user.user_id} missing required roles: {roles}")
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Missing required roles: {', '.join(roles)}"
+                    detail=f"Missing required roles: {role_names}"
                 )
             
             return await func(*args, **kwargs)
@@ -369,6 +377,15 @@ class PermissionChecker:
         return False
 
 # Route protection utilities
+_REGEX_METACHARS = frozenset(".^$*+?{}[]()|\\")
+
+def _compile_permission_map(permission_map: Dict[Tuple[str, str], Permission]) -> Dict[str, List[Tuple[re.Pattern, Permission]]]:
+    """Group route patterns by HTTP method and compile them"""
+    by_method: Dict[str, List[Tuple[re.Pattern, Permission]]] = defaultdict(list)
+    for (route_method, route_pattern), permission in permission_map.items():
+        by_method[route_method].append((re.compile(route_pattern), permission))
+    return dict(by_method)
+
 class RouteProtection:
     """Route protection utilities"""
     
@@ -390,71 +407,80 @@ class RouteProtection:
         "/api/organizations/.*/settings"
     ]
     
+    # Map HTTP methods and paths to permissions
+    PERMISSION_MAP = {
+        ("GET", "/api/users"): Permission.USER_READ,
+        ("POST", "/api/users"): Permission.USER_CREATE,
+        ("PUT", "/api/users/.*"): Permission.USER_UPDATE,
+        ("DELETE", "/api/users/.*"): Permission.USER_DELETE,
+        
+        ("GET", "/api/projects"): Permission.PROJECT_READ,
+        ("POST", "/api/projects"): Permission.PROJECT_CREATE,
+        ("PUT", "/api/projects/.*"): Permission.PROJECT_UPDATE,
+        ("DELETE", "/api/projects/.*"): Permission.PROJECT_DELETE,
+        
+        ("GET", "/api/stories"): Permission.STORY_READ,
+        ("POST", "/api/stories"): Permission.STORY_CREATE,
+        ("PUT", "/api/stories/.*"): Permission.STORY_UPDATE,
+        ("DELETE", "/api/stories/.*"): Permission.STORY_DELETE,
+        
+        ("GET", "/api/tasks"): Permission.TASK_READ,
+        ("POST", "/api/tasks"): Permission.TASK_CREATE,
+        ("PUT", "/api/tasks/.*"): Permission.TASK_UPDATE,
+        ("DELETE", "/api/tasks/.*"): Permission.TASK_DELETE,
+    }
+    
+    # Compiled once at import; each list is fused into a single alternation
+    # so a lookup is one regex match rather than a Python loop per pattern
+    _PUBLIC_RE = re.compile("|".join(f"(?:{route})" for route in PUBLIC_ROUTES))
+    # Literal entries also go in a set, so exact hits skip the regex entirely
+    _PUBLIC_EXACT = frozenset(route for route in PUBLIC_ROUTES if not _REGEX_METACHARS.intersection(route))
+    _ADMIN_RE = re.compile("|".join(f"(?:{route})" for route in ADMIN_ROUTES))
+    _PERMISSIONS_BY_METHOD = _compile_permission_map(PERMISSION_MAP)
+    
     @classmethod
     def is_public_route(cls, path: str) -> bool:
         """Check if route is public"""
-        return any(re.match(route, path) for route in cls.PUBLIC_ROUTES)
+        return path in cls._PUBLIC_EXACT or cls._PUBLIC_RE.match(path) is not None
     
     @classmethod
     def is_admin_route(cls, path: str) -> bool:
         """Check if route requires admin access"""
-        return any(re.match(route, path) for route in cls.ADMIN_ROUTES)
+        return cls._ADMIN_RE.match(path) is not None
     
     @classmethod
     def get_required_permission(cls, method: str, path: str) -> Optional[Permission]:
         """Get required permission for a route"""
-        # Map HTTP methods and paths to permissions
-        permission_map = {
-            ("GET", "/api/users"): Permission.USER_READ,
-            ("POST", "/api/users"): Permission.USER_CREATE,
-            ("PUT", "/api/users/.*"): Permission.USER_UPDATE,
-            ("DELETE", "/api/users/.*"): Permission.USER_DELETE,
-            
-            ("GET", "/api/projects"): Permission.PROJECT_READ,
-            ("POST", "/api/projects"): Permission.PROJECT_CREATE,
-            ("PUT", "/api/projects/.*"): Permission.PROJECT_UPDATE,
-            ("DELETE", "/api/projects/.*"): Permission.PROJECT_DELETE,
-            
-            ("GET", "/api/stories"): Permission.STORY_READ,
-            ("POST", "/api/stories"): Permission.STORY_CREATE,
-            ("PUT", "/api/stories/.*"): Permission.STORY_UPDATE,
-            ("DELETE", "/api/stories/.*"): Permission.STORY_DELETE,
-            
-            ("GET", "/api/tasks"): Permission.TASK_READ,
-            ("POST", "/api/tasks"): Permission.TASK_CREATE,
-            ("PUT", "/api/tasks/.*"): Permission.TASK_UPDATE,
-            ("DELETE", "/api/tasks/.*"): Permission.TASK_DELETE,
-        }
-        
-        for (route_method, route_pattern), permission in permission_map.items():
-            if method == route_method and re.match(route_pattern, path):
+        for route_pattern, permission in cls._PERMISSIONS_BY_METHOD.get(method, ()):
+            if route_pattern.match(path):
                 return permission
         
         return None
 
-# Audit logging
+# Audit logging. log_login_attempt runs on every authenticated request, so
+# messages use lazy %-formatting and cost nothing when the level is filtered
 class AuditLogger:
     """Audit logging for security events"""
     
     @staticmethod
     def log_login_attempt(user_id: str, ip_address: str, success: bool, user_agent: str = ""):
         """Log login attempt"""
-        logger.info(f"Login attempt - User: {user_id}, IP: {ip_address}, Success: {success}, UA: {user_agent}")
+        logger.info("Login attempt - User: %s, IP: %s, Success: %s, UA: %s", user_id, ip_address, success, user_agent)
     
     @staticmethod
     def log_permission_denied(user_id: str, permission: str, resource: str, ip_address: str):
         """Log permission denied event"""
-        logger.warning(f"Permission denied - User: {user_id}, Permission: {permission}, Resource: {resource}, IP: {ip_address}")
+        logger.warning("Permission denied - User: %s, Permission: %s, Resource: %s, IP: %s", user_id, permission, resource, ip_address)
     
     @staticmethod
     def log_admin_action(user_id: str, action: str, target: str, ip_address: str):
         """Log admin action"""
-        logger.info(f"Admin action - User: {user_id}, Action: {action}, Target: {target}, IP: {ip_address}")
+        logger.info("Admin action - User: %s, Action: %s, Target: %s, IP: %s", user_id, action, target, ip_address)
     
     @staticmethod
     def log_security_event(event_type: str, details: Dict[str, Any]):
         """Log security event"""
-        logger.warning(f"Security event - Type: {event_type}, Details: {details}")
+        logger.warning("Security event - Type: %s, Details: %s", event_type, details)
 
 # Global instances
 permission_checker = PermissionChecker()
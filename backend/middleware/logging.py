@@ -1,32 +1,50 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import asyncio
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Logging middleware for request/response tracking"""
-    
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
+class LoggingMiddleware:
+    """Logging middleware for request/response tracking
+
+    Written as plain ASGI rather than BaseHTTPMiddleware, which wraps every
+    request in an extra task and response stream.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        log_enabled = logger.isEnabledFor(logging.INFO)
+        method = scope["method"]
+        path = scope["path"]
+
         # Log incoming request
-        logger.info(f"Incoming request: {request.method} {request.url.path}")
-        
-        # Process the request
-        response = await call_next(request)
-        
-        # Calculate processing time
-        process_time = time.time() - start_time
-        
-        # Log response
-        logger.info(
-            f"Request completed: {request.method} {request.url.path} "
-            f"- Status: {response.status_code} - Time: {process_time:.4f}s"
-        )
-        
-        # Add processing time header
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        return response 
\ No newline at end of file
+        if log_enabled:
+            logger.info("Incoming request: %s %s", method, path)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                # Calculate processing time
+                process_time = loop.time() - start_time
+
+                # Log response
+                if log_enabled:
+                    logger.info(
+                        "Request completed: %s %s - Status: %d - Time: %.4fs",
+                        method, path, message["status"], process_time
+                    )
+
+                # Add processing time header
+                MutableHeaders(scope=message)["X-Process-Time"] = str(process_time)
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
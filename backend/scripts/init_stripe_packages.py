@@ -8,6 +8,7 @@ import asyncio
 import sys
 import os
 import logging
+from collections import Counter
 
 # Add the backend directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -48,72 +49,50 @@ async def initialize_packages():
         # Initialize Stripe products
         await stripe_package_manager.initialize_stripe_products()
         
-        # Insert package data into database
+        # Upsert package data into database in one batch; the unique
+        # package_id lets Postgres handle the insert-or-update dedup
+        package_rows = [
+            (
+                package_id,
+                config["name"],
+                config["description"],
+                config["type"].value,
+                config["billing_interval"].value,
+                config["price"],
+                config["currency"],
+                config["features"],
+                config["feature_list"],
+                config.get("trial_days", 0),
+                config.get("popular", False),
+                config.get("requires_subscription", False),
+                True
+            )
+            for package_id, config in stripe_package_manager.packages.items()
+            if not config.get("custom_pricing")  # Skip custom pricing packages
+        ]
+        
         async with get_db_connection() as conn:
-            for package_id, config in stripe_package_manager.packages.items():
-                if config.get("custom_pricing"):
-                    continue  # Skip custom pricing packages
-                
-                # Check if package already exists
-                existing = await conn.fetchrow(
-                    "SELECT id FROM stripe_products WHERE package_id = $1",
-                    package_id
-                )
-                
-                if existing:
-                    logger.info(f"Package {package_id} already exists, updating...")
-                    await conn.execute("""
-                        UPDATE stripe_products SET
-                            name = $2,
-                            description = $3,
-                            type = $4,
-                            billing_interval = $5,
-                            price = $6,
-                            currency = $7,
-                            features = $8,
-                            feature_list = $9,
-                            trial_days = $10,
-                            popular = $11,
-                            requires_subscription = $12,
-                            updated_at = NOW()
-                        WHERE package_id = $1
-                    """, 
-                        package_id,
-                        config["name"],
-                        config["description"],
-                        config["type"].value,
-                        config["billing_interval"].value,
-                        config["price"],
-                        config["currency"],
-                        config["features"],
-                        config["feature_list"],
-                        config.get("trial_days", 0),
-                        config.get("popular", False),
-                        config.get("requires_subscription", False)
-                    )
-                else:
-                    logger.info(f"Creating package {package_id}...")
-                    await conn.execute("""
-                        INSERT INTO stripe_products (
-                            package_id, name, description, type, billing_interval,
-                            price, currency, features, feature_list, trial_days,
-                            popular, requires_subscription, active
-                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-                    """, 
-                        package_id,
-                        config["name"],
-                        config["description"],
-                        config["type"].value,
-                        config["billing_interval"].value,
-                        config["price"],
-                        config["currency"],
-                        config["features"],
-                        config["feature_list"],
-                        config.get("trial_days", 0),
-                        config.get("popular", False),
-                        config.get("requires_subscription", False),
-                        True
-                    )
+            logger.info(f"Upserting {len(package_rows)} packages...")
+            await conn.executemany("""
+                INSERT INTO stripe_products (
+                    package_id, name, description, type, billing_interval,
+                    price, currency, features, feature_list, trial_days,
+                    popular, requires_subscription, active
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+                ON CONFLICT (package_id) DO UPDATE SET
+                    name = EXCLUDED.name,
+                    description = EXCLUDED.description,
+                    type = EXCLUDED.type,
+                    billing_interval = EXCLUDED.billing_interval,
+                    price = EXCLUDED.price,
+                    currency = EXCLUDED.currency,
+                    features = EXCLUDED.features,
+                    feature_list = EXCLUDED.feature_list,
+                    trial_days = EXCLUDED.trial_days,
+                    popular = EXCLUDED.popular,
+                    requires_subscription = EXCLUDED.requires_subscription,
+                    updated_at = NOW()
+            """, package_rows)
         
         logger.info("All packages initialized successfully!")
         
@@ -121,9 +100,11 @@ async def initialize_packages():
         packages = await stripe_package_manager.get_all_packages()
         logger.info(f"Total packages: {len(packages)}")
         
-        for package_type in ["subscription", "credit_pack", "add_on"]:
-            type_packages = [p for p in packages if p["type"] == package_type]
-            logger.info(f"  {package_type}: {len(type_packages)} packages")
+        type_counts = Counter(p["type"] for p in packages)
+        logger.info(", ".join(
+            f"{package_type}: {type_counts[package_type]} packages"
+            for package_type in ["subscription", "credit_pack", "add_on"]
+        ))
         
     except Exception as e:
         logger.error(f"Failed to initialize packages: {e}")
@@ -141,4 +122,11 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main()) 
\ No newline at end of file
@@ -63,21 +63,28 @@ async def run_auth_schema():
                 'sprints', 'comments', 'time_logs', 'activity_logs', 'notifications'
             ]
             
-            for table in tables_to_check:
-                result = await conn.fetchval(
-                    "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = $1)",
-                    table
-                )
-                if result:
-                    logger.info(f"✅ Table '{table}' created successfully")
-                else:
-                    logger.warning(f"⚠️  Table '{table}' not found")
+            # A single connection can't run queries concurrently, so fold the
+            # per-table checks into one round-trip instead
+            rows = await conn.fetch(
+                "SELECT table_name FROM information_schema.tables WHERE table_name = ANY($1::text[])",
+                tables_to_check
+            )
+            existing_tables = {row['table_name'] for row in rows}
+            missing_tables = [table for table in tables_to_check if table not in existing_tables]
+            
+            # One summary line instead of a log call per table
+            logger.info(f"✅ {len(tables_to_check) - len(missing_tables)}/{len(tables_to_check)} tables created successfully")
+            if missing_tables:
+                logger.warning(f"⚠️  Tables not found: {', '.join(missing_tables)}")
             
             # Check if initial data was inserted
-            role_count = await conn.fetchval("SELECT COUNT(*) FROM roles")
-            permission_count = await conn.fetchval("SELECT COUNT(*) FROM permissions")
+            counts = await conn.fetchrow("""
+                SELECT
+                    (SELECT COUNT(*) FROM roles) AS role_count,
+                    (SELECT COUNT(*) FROM permissions) AS permission_count
+            """)
             
-            logger.info(f"✅ Initial data loaded: {role_count} roles, {permission_count} permissions")
+            logger.info(f"✅ Initial data loaded: {counts['role_count']} roles, {counts['permission_count']} permissions")
             
             return True
             
@@ -113,4 +120,11 @@ if __name__ == "__main__":
                     key, value = line.split('=', 1)
                     os.environ[key] = value
     
+    # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main()) 
\ No newline at end of file
@@ -218,10 +218,12 @@ def main():
     logger.info("🚀 Auth Schema Deployment Tool")
     logger.info("=" * 50)
     
-    print("\nOptions:")
-    print("1. Output SQL files for manual execution")
-    print("2. Try local PostgreSQL execution")
-    print("3. Both")
+    print(
+        "\nOptions:\n"
+        "1. Output SQL files for manual execution\n"
+        "2. Try local PostgreSQL execution\n"
+        "3. Both"
+    )
     
     choice = input("\nChoose an option (1-3): ").strip()
     
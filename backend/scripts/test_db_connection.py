@@ -46,9 +46,8 @@ async def test_connection():
             ORDER BY table_name
         """)
         
-        logger.info(f"Existing tables ({len(tables)}):")
-        for table in tables:
-            logger.info(f"  - {table['table_name']}")
+        table_lines = "\n".join(f"  - {table['table_name']}" for table in tables)
+        logger.info(f"Existing tables ({len(tables)}):\n{table_lines}")
         
         await conn.close()
         return True
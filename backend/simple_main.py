@@ -23,6 +23,12 @@ JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# Password hashing configuration
+BCRYPT_ROUNDS = 12
+# The demo password is a published constant, so its hash gains nothing from
+# production-grade cost; the minimum keeps import-time hashing cheap
+DEMO_BCRYPT_ROUNDS = 4
+
 # Security
 security = HTTPBearer()
 
@@ -84,7 +90,7 @@ password_reset_tokens: Dict[str, Dict] = {}
 def init_sample_data():
     # Create a sample user for testing
     sample_user_id = str(uuid.uuid4())
-    hashed_password = hash_password("password123")
+    hashed_password = hash_password("password123", rounds=DEMO_BCRYPT_ROUNDS)
     
     users_db[sample_user_id] = {
         "id": sample_user_id,
@@ -95,9 +101,9 @@ def init_sample_data():
         "created_at": datetime.now().isoformat()
     }
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
@@ -106,12 +112,12 @@ def verify_password(password: str, hashed: str) -> bool:
 
 def create_access_token(user_id: str, email: str) -> str:
     """Create a JWT access token"""
-    expire = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
+    issued_at = datetime.utcnow()
     payload = {
         "user_id": user_id,
         "email": email,
-        "exp": expire,
-        "iat": datetime.utcnow()
+        "exp": issued_at + timedelta(hours=JWT_EXPIRATION_HOURS),
+        "iat": issued_at
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
@@ -292,54 +298,56 @@ async def get_users(current_user: UserResponse = Depends(get_current_user)):
         for user in users_db.values()
     ]
 
+# Static mock rows are built once at import; endpoints only add timestamps
+MOCK_STORIES = (
+    {
+        "id": "story-1",
+        "epic_id": "epic-1",
+        "title": "User Authentication",
+        "description": "Implement user login and registration",
+        "story_key": "AGF-1",
+        "as_a": "user",
+        "i_want": "to authenticate",
+        "so_that": "I can access the system",
+        "acceptance_criteria": "User can register and login successfully",
+        "status": "in-progress",
+        "priority": "high",
+        "story_points": 5,
+        "assignee_id": None,
+        "due_date": None,
+        "created_by": "user-1"
+    },
+    {
+        "id": "story-2",
+        "epic_id": "epic-1",
+        "title": "Data Persistence",
+        "description": "Save user data and preferences",
+        "story_key": "AGF-2",
+        "as_a": "user",
+        "i_want": "my data to be saved",
+        "so_that": "I don't lose my work",
+        "acceptance_criteria": "User data persists across sessions",
+        "status": "backlog",
+        "priority": "medium",
+        "story_points": 3,
+        "assignee_id": None,
+        "due_date": None,
+        "created_by": "user-1"
+    },
+)
+
 @app.get("/api/stories")
 async def get_stories():
     """Get all stories"""
-    return [
-        {
-            "id": "story-1",
-            "epic_id": "epic-1",
-            "title": "User Authentication",
-            "description": "Implement user login and registration",
-            "story_key": "AGF-1",
-            "as_a": "user",
-            "i_want": "to authenticate",
-            "so_that": "I can access the system",
-            "acceptance_criteria": "User can register and login successfully",
-            "status": "in-progress",
-            "priority": "high",
-            "story_points": 5,
-            "assignee_id": None,
-            "due_date": None,
-            "created_by": "user-1",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        },
-        {
-            "id": "story-2",
-            "epic_id": "epic-1",
-            "title": "Data Persistence",
-            "description": "Save user data and preferences",
-            "story_key": "AGF-2",
-            "as_a": "user",
-            "i_want": "my data to be saved",
-            "so_that": "I don't lose my work",
-            "acceptance_criteria": "User data persists across sessions",
-            "status": "backlog",
-            "priority": "medium",
-            "story_points": 3,
-            "assignee_id": None,
-            "due_date": None,
-            "created_by": "user-1",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-    ]
+    # One timestamp per response rather than two clock reads per item
+    now = datetime.now().isoformat()
+    return [{**story, "created_at": now, "updated_at": now} for story in MOCK_STORIES]
 
 @app.post("/api/stories")
 async def create_story(story_data: dict, current_user: UserResponse = Depends(get_current_user)):
     """Create a new story"""
     story_id = str(uuid.uuid4())
+    now = datetime.now().isoformat()
     new_story = {
         "id": story_id,
         "epic_id": story_data.get("epic_id", "epic-1"),
@@ -356,75 +364,78 @@ async def create_story(story_data: dict, current_user: UserResponse = Depends(ge
         "assignee_id": story_data.get("assignee_id"),
         "due_date": story_data.get("due_date"),
         "created_by": current_user.id,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat()
+        "created_at": now,
+        "updated_at": now
     }
     return new_story
 
+MOCK_EPICS = (
+    {
+        "id": "epic-1",
+        "project_id": "proj-1",
+        "title": "User Management",
+        "description": "Complete user management system",
+        "epic_key": "AGF-E1",
+        "status": "in-progress",
+        "priority": "high",
+        "start_date": None,
+        "target_end_date": None,
+        "estimated_story_points": 20,
+        "actual_story_points": 8,
+        "progress": 40,
+        "created_by": "user-1"
+    },
+)
+
 @app.get("/api/epics")
 async def get_epics():
     """Get all epics"""
-    return [
-        {
-            "id": "epic-1",
-            "project_id": "proj-1",
-            "title": "User Management",
-            "description": "Complete user management system",
-            "epic_key": "AGF-E1",
-            "status": "in-progress",
-            "priority": "high",
-            "start_date": None,
-            "target_end_date": None,
-            "estimated_story_points": 20,
-            "actual_story_points": 8,
-            "progress": 40,
-            "created_by": "user-1",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-    ]
+    now = datetime.now().isoformat()
+    return [{**epic, "created_at": now, "updated_at": now} for epic in MOCK_EPICS]
+
+MOCK_PROJECTS = (
+    {
+        "id": "proj-1",
+        "name": "AgileForge Platform",
+        "key": "AGF",
+        "description": "Complete project management platform",
+        "status": "in-progress",
+        "priority": "high",
+        "start_date": None,
+        "target_end_date": None,
+        "progress": 35,
+        "created_by": "user-1"
+    },
+)
 
 @app.get("/api/projects")
 async def get_projects():
     """Get all projects"""
-    return [
-        {
-            "id": "proj-1",
-            "name": "AgileForge Platform",
-            "key": "AGF",
-            "description": "Complete project management platform",
-            "status": "in-progress",
-            "priority": "high",
-            "start_date": None,
-            "target_end_date": None,
-            "progress": 35,
-            "created_by": "user-1",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-    ]
+    now = datetime.now().isoformat()
+    return [{**project, "created_at": now, "updated_at": now} for project in MOCK_PROJECTS]
+
+MOCK_TASKS = (
+    {
+        "id": "task-1",
+        "story_id": "story-1",
+        "title": "Setup authentication backend",
+        "description": "Configure JWT and password hashing",
+        "task_key": "AGF-T1",
+        "status": "in-progress",
+        "priority": "high",
+        "assignee_id": None,
+        "estimated_hours": 8,
+        "actual_hours": 4,
+        "due_date": None,
+        "created_by": "user-1"
+    },
+)
 
 @app.get("/api/tasks")
 async def get_tasks():
     """Get all tasks"""
-    return [
-        {
-            "id": "task-1",
-            "story_id": "story-1",
-            "title": "Setup authentication backend",
-            "description": "Configure JWT and password hashing",
-            "task_key": "AGF-T1",
-            "status": "in-progress",
-            "priority": "high",
-            "assignee_id": None,
-            "estimated_hours": 8,
-            "actual_hours": 4,
-            "due_date": None,
-            "created_by": "user-1",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
-    ]
+    now = datetime.now().isoformat()
+    return [{**task, "created_at": now, "updated_at": now} for task in MOCK_TASKS]
 
 # Initialize sample data
 init_sample_data()